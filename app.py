@@ -6,36 +6,153 @@ Features: priority, status, estimated effort, and target date tracking.
 """
 
 from flask import Flask, render_template, request, jsonify
-import json
+from flask.json.provider import JSONProvider
+import orjson
+import atexit
 import os
+import signal
+import threading
 from datetime import datetime, date
+from functools import lru_cache
+from itertools import compress
 from pathlib import Path
 
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider that uses orjson for request and response bodies."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of
+        # decoding to str and letting the base class encode them again
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # File to store todos
 TODO_FILE = Path(__file__).parent / "todos.json"
 
+# Write compact JSON unless TODO_PRETTY=1 asks for a human-readable file
+SAVE_OPTIONS = orjson.OPT_APPEND_NEWLINE
+if os.environ.get("TODO_PRETTY") == "1":
+    SAVE_OPTIONS |= orjson.OPT_INDENT_2
 
-def load_todos():
-    """Load todos from the JSON file."""
-    if TODO_FILE.exists():
-        with open(TODO_FILE, "r") as f:
-            return json.load(f)
-    return []
+# In-memory copy of the todos, re-read only when the file changes on disk
+_todos_cache = None
+_todos_by_id = {}
+_todos_mtime = 0
+_todos_lock = threading.RLock()
 
+# Next ID to hand out; persisted alongside the todos so IDs are never reused
+_next_id = 1
+
+# Day ordinal the cached todos' computed fields were last refreshed for
+_derived_day = None
+
+# Pending delayed write, so a burst of updates is flushed to disk once
+SAVE_DELAY = 0.1
+_save_timer = None
+
+# Per-field columns of the cached todos for /api/summary, rebuilt after changes
+_summary_columns = None
 
-def save_todos(todos):
-    """Save todos to the JSON file."""
-    with open(TODO_FILE, "w") as f:
-        json.dump(todos, f, indent=2)
+
+def load_todos():
+    """Load todos, reusing the in-memory copy unless the file has changed."""
+    global _todos_cache, _todos_by_id, _todos_mtime, _next_id, _derived_day, _summary_columns
+    with _todos_lock:
+        # Unsaved changes in memory take precedence over the file on disk
+        if _save_timer is None and TODO_FILE.exists():
+            st = TODO_FILE.stat()
+            if _todos_cache is None or st.st_mtime != _todos_mtime:
+                with open(TODO_FILE, "rb") as f:
+                    data = orjson.loads(f.read())
+                if isinstance(data, list):
+                    # Old format: a bare list of todos without an ID counter
+                    data = {"next_id": max((t["id"] for t in data), default=0) + 1, "todos": data}
+                _todos_cache = data["todos"]
+                _todos_by_id = {t["id"]: t for t in _todos_cache}
+                _next_id = data["next_id"]
+                _todos_mtime = st.st_mtime
+                _derived_day = None
+        elif _todos_cache is None:
+            _todos_cache = []
+
+        # Computed fields only go stale when the calendar day changes
+        today = date.today()
+        if today.toordinal() != _derived_day:
+            for todo in _todos_cache:
+                set_computed_fields(todo, today)
+            _derived_day = today.toordinal()
+            _summary_columns = None
+        return _todos_cache
 
 
-def get_next_id(todos):
-    """Get the next available ID."""
-    if not todos:
-        return 1
-    return max(todo["id"] for todo in todos) + 1
+def save_todos(todos):
+    """Save todos to the JSON file and refresh the in-memory copy."""
+    global _todos_cache, _todos_by_id, _todos_mtime, _summary_columns
+    with _todos_lock:
+        data = {"next_id": _next_id, "todos": todos}
+        buf = orjson.dumps(data, option=SAVE_OPTIONS)
+        # Write to a temp file and swap it in so a crash never leaves a partial file
+        tmp = TODO_FILE.with_suffix(".json.tmp")
+        with open(tmp, "wb") as f:
+            f.write(buf)
+        os.replace(tmp, TODO_FILE)
+        if todos is not _todos_cache:
+            _todos_by_id = {t["id"]: t for t in todos}
+            _summary_columns = None
+        _todos_cache = todos
+        _todos_mtime = TODO_FILE.stat().st_mtime
+
+
+def schedule_save(todos):
+    """Update the in-memory todos and write them to disk after SAVE_DELAY."""
+    global _todos_cache, _todos_by_id, _save_timer, _summary_columns
+    with _todos_lock:
+        if todos is not _todos_cache:
+            _todos_by_id = {t["id"]: t for t in todos}
+        _todos_cache = todos
+        _summary_columns = None
+        if _save_timer is None:
+            _save_timer = threading.Timer(SAVE_DELAY, _flush)
+            _save_timer.daemon = True
+            _save_timer.start()
+
+
+def _flush():
+    """Write any pending changes to disk."""
+    global _save_timer
+    with _todos_lock:
+        if _save_timer is not None:
+            _save_timer.cancel()
+            _save_timer = None
+            save_todos(_todos_cache)
+
+
+atexit.register(_flush)
+
+
+def _exit_on_signal(signum, frame):
+    """Turn a terminate signal into a normal exit so _flush runs."""
+    raise SystemExit(128 + signum)
+
+
+def get_next_id():
+    """Reserve and return the next available ID."""
+    global _next_id
+    with _todos_lock:
+        todo_id = _next_id
+        _next_id += 1
+        return todo_id
 
 
 @app.route("/")
@@ -47,42 +164,50 @@ def index():
 @app.route("/api/todos", methods=["GET"])
 def get_todos():
     """Get all todos with computed target date info."""
-    todos = load_todos()
-    # Add computed fields for each todo
-    for todo in todos:
-        target_date = todo.get("target_date", "")
-        status = todo.get("status", "pending")
-        todo["days_until_target"] = calculate_days_until_target(target_date)
-        todo["target_status"] = get_target_status(target_date, status)
-    return jsonify(todos)
+    # Computed fields are kept up to date by load_todos
+    return jsonify(load_todos())
 
 
 # Valid status values
 VALID_STATUSES = ["pending", "in_progress", "on_hold", "completed"]
+_VALID_STATUS_SET = frozenset(VALID_STATUSES)
+_INVALID_STATUS_ERROR = f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"
 
 # Valid effort values (in hours)
 VALID_EFFORTS = ["0.5", "1", "2", "4", "8", "16", "24", "40"]
 
 
-def calculate_days_until_target(target_date_str):
-    """Calculate days remaining until target date."""
-    if not target_date_str:
+@lru_cache(maxsize=1024)
+def _days_until(target_date_str, today_ordinal):
+    """Days from the given day ordinal to target_date_str, or None if invalid."""
+    if len(target_date_str) != 10:
         return None
     try:
-        target = datetime.strptime(target_date_str, "%Y-%m-%d").date()
-        today = date.today()
-        delta = (target - today).days
-        return delta
-    except (ValueError, TypeError):
+        return date.fromisoformat(target_date_str).toordinal() - today_ordinal
+    except ValueError:
         return None
 
 
-def get_target_status(target_date_str, status):
+def calculate_days_until_target(target_date_str, today=None):
+    """Calculate days remaining until target date."""
+    if not target_date_str or not isinstance(target_date_str, str):
+        return None
+    if today is None:
+        today = date.today()
+    return _days_until(target_date_str, today.toordinal())
+
+
+def get_target_status(target_date_str, status, today=None):
     """Get status indicator based on target date proximity."""
     if status == "completed":
         return "completed"
+    return _target_status_from_days(calculate_days_until_target(target_date_str, today), status)
+
 
-    days = calculate_days_until_target(target_date_str)
+def _target_status_from_days(days, status):
+    """Get status indicator from already-computed days until target."""
+    if status == "completed":
+        return "completed"
     if days is None:
         return "no_target"
     elif days < 0:
@@ -95,6 +220,13 @@ def get_target_status(target_date_str, status):
         return "on_track"
 
 
+def set_computed_fields(todo, today=None):
+    """Fill in days_until_target and target_status for a todo."""
+    days = calculate_days_until_target(todo.get("target_date", ""), today)
+    todo["days_until_target"] = days
+    todo["target_status"] = _target_status_from_days(days, todo.get("status", "pending"))
+
+
 @app.route("/api/todos", methods=["POST"])
 def add_todo():
     """Add a new todo."""
@@ -103,29 +235,32 @@ def add_todo():
     if not data or not data.get("task"):
         return jsonify({"error": "Task is required"}), 400
 
-    todos = load_todos()
-
-    # Parse effort as float for calculations, store as string
-    effort = data.get("effort", "")
-    target_date = data.get("target_date", "")
-
-    todo = {
-        "id": get_next_id(todos),
-        "task": data["task"],
-        "priority": data.get("priority", "medium"),
-        "status": "pending",
-        "effort": effort,  # Estimated effort in hours
-        "target_date": target_date,  # Target completion date (YYYY-MM-DD)
-        "created_at": datetime.now().isoformat(),
-        "completed_at": None
-    }
-
-    # Add computed fields
-    todo["days_until_target"] = calculate_days_until_target(target_date)
-    todo["target_status"] = get_target_status(target_date, "pending")
-
-    todos.append(todo)
-    save_todos(todos)
+    with _todos_lock:
+        todos = load_todos()
+        now = datetime.now()
+        today = now.date()
+
+        # Parse effort as float for calculations, store as string
+        effort = data.get("effort", "")
+        target_date = data.get("target_date", "")
+
+        todo = {
+            "id": get_next_id(),
+            "task": data["task"],
+            "priority": data.get("priority", "medium"),
+            "status": "pending",
+            "effort": effort,  # Estimated effort in hours
+            "target_date": target_date,  # Target completion date (YYYY-MM-DD)
+            "created_at": now.isoformat(),
+            "completed_at": None
+        }
+
+        # Add computed fields
+        set_computed_fields(todo, today)
+
+        todos.append(todo)
+        _todos_by_id[todo["id"]] = todo
+        schedule_save(todos)
 
     return jsonify(todo), 201
 
@@ -134,60 +269,62 @@ def add_todo():
 def update_todo(todo_id):
     """Update a todo (change status, edit task, priority, effort, or target_date)."""
     data = request.get_json()
-    todos = load_todos()
-
-    for todo in todos:
-        if todo["id"] == todo_id:
-            if "status" in data:
-                if data["status"] not in VALID_STATUSES:
-                    return jsonify({"error": f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}"}), 400
-                todo["status"] = data["status"]
-                if data["status"] == "completed":
-                    todo["completed_at"] = datetime.now().isoformat()
-                else:
-                    todo["completed_at"] = None
-            if "task" in data:
-                todo["task"] = data["task"]
-            if "priority" in data:
-                todo["priority"] = data["priority"]
-            if "effort" in data:
-                todo["effort"] = data["effort"]
-            if "target_date" in data:
-                todo["target_date"] = data["target_date"]
-
-            # Update computed fields
-            target_date = todo.get("target_date", "")
-            status = todo.get("status", "pending")
-            todo["days_until_target"] = calculate_days_until_target(target_date)
-            todo["target_status"] = get_target_status(target_date, status)
-
-            save_todos(todos)
-            return jsonify(todo)
-
-    return jsonify({"error": "Todo not found"}), 404
+    with _todos_lock:
+        todos = load_todos()
+        now = datetime.now()
+        today = now.date()
+
+        todo = _todos_by_id.get(todo_id)
+        if todo is None:
+            return jsonify({"error": "Todo not found"}), 404
+
+        if "status" in data:
+            if not isinstance(data["status"], str) or data["status"] not in _VALID_STATUS_SET:
+                return jsonify({"error": _INVALID_STATUS_ERROR}), 400
+            todo["status"] = data["status"]
+            if data["status"] == "completed":
+                todo["completed_at"] = now.isoformat()
+            else:
+                todo["completed_at"] = None
+        if "task" in data:
+            todo["task"] = data["task"]
+        if "priority" in data:
+            todo["priority"] = data["priority"]
+        if "effort" in data:
+            todo["effort"] = data["effort"]
+        if "target_date" in data:
+            todo["target_date"] = data["target_date"]
+
+        # Update computed fields
+        set_computed_fields(todo, today)
+
+        schedule_save(todos)
+        return jsonify(todo)
 
 
 @app.route("/api/todos/<int:todo_id>", methods=["DELETE"])
 def delete_todo(todo_id):
     """Delete a todo."""
-    todos = load_todos()
+    with _todos_lock:
+        todos = load_todos()
 
-    for i, todo in enumerate(todos):
-        if todo["id"] == todo_id:
-            removed = todos.pop(i)
-            save_todos(todos)
-            return jsonify({"message": "Todo deleted", "todo": removed})
+        removed = _todos_by_id.pop(todo_id, None)
+        if removed is None:
+            return jsonify({"error": "Todo not found"}), 404
 
-    return jsonify({"error": "Todo not found"}), 404
+        todos.remove(removed)
+        schedule_save(todos)
+        return jsonify({"message": "Todo deleted", "todo": removed})
 
 
 @app.route("/api/todos/clear-completed", methods=["DELETE"])
 def clear_completed():
     """Clear all completed todos."""
-    todos = load_todos()
-    active_todos = [t for t in todos if t.get("status", "pending") != "completed"]
-    removed_count = len(todos) - len(active_todos)
-    save_todos(active_todos)
+    with _todos_lock:
+        todos = load_todos()
+        active_todos = [t for t in todos if t.get("status", "pending") != "completed"]
+        removed_count = len(todos) - len(active_todos)
+        schedule_save(active_todos)
 
     return jsonify({"message": f"Cleared {removed_count} completed todo(s)", "count": removed_count})
 
@@ -204,47 +341,49 @@ def get_efforts():
     return jsonify(VALID_EFFORTS)
 
 
-@app.route("/api/summary", methods=["GET"])
-def get_summary():
-    """Get summary statistics including effort tracking."""
-    todos = load_todos()
-
-    total_effort = 0
-    completed_effort = 0
-    overdue_count = 0
-    due_soon_count = 0
-
+def _build_summary_columns(todos):
+    """Split the todos into parallel effort, completed and target_status lists."""
+    efforts = []
+    completed = []
+    target_statuses = []
     for todo in todos:
-        effort = todo.get("effort", "")
+        effort_hours = 0.0
+        effort = todo.get("effort")
         if effort:
             try:
                 effort_hours = float(effort)
-                total_effort += effort_hours
-                if todo.get("status") == "completed":
-                    completed_effort += effort_hours
             except ValueError:
                 pass
+        efforts.append(effort_hours)
+        completed.append(todo.get("status") == "completed")
+        target_statuses.append(todo.get("target_status"))
+    return efforts, completed, target_statuses
+
 
-        # Calculate target date status
-        target_date = todo.get("target_date", "")
-        status = todo.get("status", "pending")
-        target_status = get_target_status(target_date, status)
+@app.route("/api/summary", methods=["GET"])
+def get_summary():
+    """Get summary statistics including effort tracking."""
+    global _summary_columns
+    with _todos_lock:
+        todos = load_todos()
+        if _summary_columns is None:
+            _summary_columns = _build_summary_columns(todos)
+        efforts, completed, target_statuses = _summary_columns
 
-        if target_status == "overdue":
-            overdue_count += 1
-        elif target_status in ["due_today", "due_soon"]:
-            due_soon_count += 1
+    total_effort = sum(efforts)
+    completed_effort = sum(compress(efforts, completed))
 
     return jsonify({
-        "total_tasks": len(todos),
-        "completed_tasks": len([t for t in todos if t.get("status") == "completed"]),
+        "total_tasks": len(efforts),
+        "completed_tasks": sum(completed),
         "total_effort_hours": total_effort,
         "completed_effort_hours": completed_effort,
         "remaining_effort_hours": total_effort - completed_effort,
-        "overdue_count": overdue_count,
-        "due_soon_count": due_soon_count
+        "overdue_count": target_statuses.count("overdue"),
+        "due_soon_count": target_statuses.count("due_today") + target_statuses.count("due_soon")
     })
 
 
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, _exit_on_signal)
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -5,14 +5,67 @@ A simple command-line application to manage your daily tasks.
 Features: priority, status, estimated effort, and target date tracking.
 """
 
+import atexit
 import json
 import os
+import re
+import signal
+import sys
 from datetime import datetime, date
+from functools import lru_cache
+from itertools import compress
 from pathlib import Path
 
+# orjson is optional; fall back to the standard library json module without it
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
 # File to store todos
 TODO_FILE = Path.home() / ".todo_list.json"
 
+# Buffer size for reading and writing TODO_FILE
+IO_BUFFER_SIZE = 1 << 16
+
+# Todos read from TODO_FILE, kept in memory for the rest of the session
+_todos_cache = None
+_id_index = {}
+
+# Set when the in-memory todos have changes not yet written by flush_todos
+_dirty = False
+
+# Per-field columns of the in-memory todos for list_todos, rebuilt after changes
+_columns = None
+
+# Rendered list_todos output by (show_all, filter_by, day ordinal)
+_listing_cache = {}
+
+# Next ID to hand out; persisted alongside the todos so IDs stay stable
+_next_id = 1
+
+# Absolute date formats accepted by parse_date
+DATE_FORMATS = (
+    "%Y-%m-%d",      # 2024-01-15
+    "%d/%m/%Y",      # 15/01/2024
+    "%m/%d/%Y",      # 01/15/2024
+    "%d-%m-%Y",      # 15-01-2024
+)
+
+# Cheap check for tokens that could be a date, before trying parse_date
+_DATE_HINT = re.compile(r"(?:today|tomorrow|[-+]?\d)")
+
+# Valid priority levels
+PRIORITIES = frozenset(("high", "medium", "low"))
+
 # Valid effort values (in hours)
 EFFORT_OPTIONS = {
     "30m": "0.5",
@@ -36,95 +89,161 @@ EFFORT_DISPLAY = {
     "40": "1w"
 }
 
+# Priority colors/symbols
+PRIORITY_SYMBOLS = {
+    "high": "🔴",
+    "medium": "🟡",
+    "low": "🟢"
+}
+
+# Status symbols
+STATUS_SYMBOLS = {
+    "pending": "⏳",
+    "in_progress": "🔄",
+    "on_hold": "⏸️",
+    "completed": "✅"
+}
+
+# Target date status symbols
+TARGET_INDICATORS = {
+    "overdue": "🚨",
+    "due_today": "⚡",
+    "due_soon": "⏰",
+    "on_track": "📅",
+    "no_target": "",
+    "completed": "✅"
+}
+
+# Listing sort order: overdue first, then by priority
+TARGET_ORDER = {"overdue": 0, "due_today": 1, "due_soon": 2, "on_track": 3, "no_target": 4, "completed": 5}
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
 
 def load_todos():
-    """Load todos from the JSON file."""
-    if TODO_FILE.exists():
-        with open(TODO_FILE, "r") as f:
-            return json.load(f)
-    return []
+    """Load todos from the JSON file, reading it only on first use."""
+    global _todos_cache, _id_index, _next_id
+    if _todos_cache is None:
+        if TODO_FILE.exists():
+            with open(TODO_FILE, "rb", buffering=IO_BUFFER_SIZE) as f:
+                data = _loads(f.read())
+            if isinstance(data, list):
+                # Old format: a bare list of todos without an ID counter
+                data = {"next_id": max((t["id"] for t in data), default=0) + 1, "todos": data}
+            _todos_cache = data["todos"]
+            _id_index = {t["id"]: t for t in _todos_cache}
+            _next_id = data["next_id"]
+        else:
+            _todos_cache = []
+    return _todos_cache
 
 
 def save_todos(todos):
-    """Save todos to the JSON file."""
-    with open(TODO_FILE, "w") as f:
-        json.dump(todos, f, indent=2)
+    """Keep todos as the in-memory copy and mark them for writing on exit."""
+    global _todos_cache, _id_index, _dirty, _columns
+    if todos is not _todos_cache:
+        _id_index = {t["id"]: t for t in todos}
+    _todos_cache = todos
+    _dirty = True
+    _columns = None
+    _listing_cache.clear()
+
+
+def flush_todos():
+    """Write the todos to the JSON file if they have unsaved changes."""
+    global _dirty
+    if not _dirty:
+        return
+    buf = _dumps({"next_id": _next_id, "todos": _todos_cache})
+    # Write to a temp file and swap it in so a crash never leaves a partial file
+    tmp = TODO_FILE.with_suffix(".json.tmp")
+    with open(tmp, "wb", buffering=IO_BUFFER_SIZE) as f:
+        f.write(buf)
+    os.replace(tmp, TODO_FILE)
+    _dirty = False
+
+
+atexit.register(flush_todos)
 
 
-def calculate_days_until_target(target_date_str):
+def get_next_id():
+    """Reserve and return the next available ID."""
+    global _next_id
+    todo_id = _next_id
+    _next_id += 1
+    return todo_id
+
+
+@lru_cache(maxsize=512)
+def _parse_iso(date_str):
+    """Parse a YYYY-MM-DD string into a date, memoized per string."""
+    return date.fromisoformat(date_str)
+
+
+def calculate_days_until_target(target_date_str, today_ordinal=None):
     """Calculate days remaining until target date."""
     if not target_date_str:
         return None
+    if today_ordinal is None:
+        today_ordinal = date.today().toordinal()
     try:
-        target = datetime.strptime(target_date_str, "%Y-%m-%d").date()
-        today = date.today()
-        delta = (target - today).days
-        return delta
+        if len(target_date_str) != 10:
+            return None
+        return _parse_iso(target_date_str).toordinal() - today_ordinal
     except (ValueError, TypeError):
         return None
 
 
-def get_target_status(target_date_str, status):
-    """Get status indicator based on target date proximity."""
+# Target status by days until target, clamped to -1 (overdue) .. 3+ (on track)
+TARGET_STATUS_BY_DAYS = ("overdue", "due_today", "due_soon", "due_soon", "on_track")
+
+
+def _target_status_from_days(days, status):
+    """Get status indicator from already-computed days until target."""
     if status == "completed":
         return "completed"
-
-    days = calculate_days_until_target(target_date_str)
     if days is None:
         return "no_target"
-    elif days < 0:
-        return "overdue"
-    elif days == 0:
-        return "due_today"
-    elif days <= 2:
-        return "due_soon"
-    else:
-        return "on_track"
-
-
-def get_target_indicator(target_date_str, status):
-    """Get visual indicator for target date status."""
-    target_status = get_target_status(target_date_str, status)
-    indicators = {
-        "overdue": "🚨",
-        "due_today": "⚡",
-        "due_soon": "⏰",
-        "on_track": "📅",
-        "no_target": "",
-        "completed": "✅"
-    }
-    return indicators.get(target_status, "")
+    return TARGET_STATUS_BY_DAYS[min(max(days + 1, 0), 4)]
+
+
+def target_status_indicator(target_status):
+    """Get visual indicator for an already-computed target status."""
+    return TARGET_INDICATORS.get(target_status, "")
 
 
 def parse_date(date_str):
     """Parse date string in various formats."""
     if not date_str:
         return None
+    # Relative dates depend on the current day, so it is part of the cache key
+    return _parse_date(date_str, date.today().toordinal())
 
-    # Try different date formats
-    formats = [
-        "%Y-%m-%d",      # 2024-01-15
-        "%d/%m/%Y",      # 15/01/2024
-        "%m/%d/%Y",      # 01/15/2024
-        "%d-%m-%Y",      # 15-01-2024
-    ]
 
-    # Handle relative dates
+@lru_cache(maxsize=256)
+def _parse_date(date_str, today_ordinal):
+    """Parse a non-empty date string relative to the given day, memoized."""
+    # Fast path for YYYY-MM-DD, the format target dates are stored in
+    if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+        try:
+            return date.fromisoformat(date_str).isoformat()
+        except ValueError:
+            pass
+
+    # Handle relative dates as plain day-ordinal arithmetic
     date_str_lower = date_str.lower()
     if date_str_lower == "today":
-        return date.today().strftime("%Y-%m-%d")
+        return date.fromordinal(today_ordinal).strftime("%Y-%m-%d")
     elif date_str_lower == "tomorrow":
-        from datetime import timedelta
-        return (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+        return date.fromordinal(today_ordinal + 1).strftime("%Y-%m-%d")
     elif date_str_lower.endswith("d"):
         try:
             days = int(date_str_lower[:-1])
-            from datetime import timedelta
-            return (date.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+            return date.fromordinal(today_ordinal + days).strftime("%Y-%m-%d")
         except ValueError:
             pass
 
-    for fmt in formats:
+    # Try different date formats
+    for fmt in DATE_FORMATS:
         try:
             parsed = datetime.strptime(date_str, fmt)
             return parsed.strftime("%Y-%m-%d")
@@ -146,17 +265,17 @@ def add_todo(task, priority="medium", effort="", target_date=""):
     parsed_date = parse_date(target_date) if target_date else ""
 
     todo = {
-        "id": len(todos) + 1,
+        "id": get_next_id(),
         "task": task,
         "priority": priority,
         "status": "pending",
         "effort": effort,
         "target_date": parsed_date,
-        "completed": False,
         "created_at": datetime.now().isoformat(),
         "completed_at": None
     }
     todos.append(todo)
+    _id_index[todo["id"]] = todo
     save_todos(todos)
 
     effort_display = f" | Effort: {EFFORT_DISPLAY.get(effort, effort)}" if effort else ""
@@ -164,87 +283,119 @@ def add_todo(task, priority="medium", effort="", target_date=""):
     print(f"✅ Added: '{task}' (Priority: {priority}{effort_display}{date_display})")
 
 
+def _todo_columns():
+    """Split the stored todos into parallel field lists, rebuilt only after changes."""
+    global _columns
+    if _columns is None:
+        todos = load_todos()
+        statuses = []
+        completed = []
+        efforts = []
+        priorities = []
+        target_dates = []
+        for todo in todos:
+            status = todo.get("status", "pending")
+            statuses.append(status)
+            completed.append(status == "completed" or bool(todo.get("completed")))
+            effort_hours = 0.0
+            effort = todo.get("effort", "")
+            if effort:
+                try:
+                    effort_hours = float(effort)
+                except ValueError:
+                    pass
+            efforts.append(effort_hours)
+            priorities.append(todo.get("priority", "medium"))
+            target_dates.append(todo.get("target_date", ""))
+        _columns = (statuses, completed, efforts, priorities, target_dates)
+    return _columns
+
+
 def list_todos(show_all=False, filter_by=None):
     """List all todo items."""
+    # The listing only changes when the todos or the current day change
+    key = (show_all, filter_by, date.today().toordinal())
+    output = _listing_cache.get(key)
+    if output is None:
+        output = _listing_cache[key] = _format_todo_list(show_all, filter_by, key[2])
+    sys.stdout.write(output)
+
+
+def _format_todo_list(show_all, filter_by, today_ordinal):
+    """Build the text printed by list_todos."""
     todos = load_todos()
 
     if not todos:
-        print("📋 No todos yet! Add some tasks to get started.")
-        return
+        return "📋 No todos yet! Add some tasks to get started.\n"
+
+    # Work column by column: totals come from sum()/count() over whole lists
+    # and only the date arithmetic is done per todo
+    statuses, completed, efforts, priorities, target_dates = _todo_columns()
+    total_effort = sum(efforts)
+    completed_effort = sum(compress(efforts, completed))
+    completed_count = sum(completed)
+
+    days_left = [calculate_days_until_target(d, today_ordinal) for d in target_dates]
+    target_statuses = list(map(_target_status_from_days, days_left, statuses))
+    overdue_count = target_statuses.count("overdue")
 
     # Filter based on show_all flag and specific filter
     if filter_by == "overdue":
-        display_todos = [t for t in todos if get_target_status(t.get("target_date", ""), t.get("status", "pending")) == "overdue"]
+        shown = [i for i, ts in enumerate(target_statuses) if ts == "overdue"]
     elif filter_by == "due_soon":
-        display_todos = [t for t in todos if get_target_status(t.get("target_date", ""), t.get("status", "pending")) in ["due_today", "due_soon"]]
+        shown = [i for i, ts in enumerate(target_statuses) if ts == "due_today" or ts == "due_soon"]
     elif not show_all:
-        display_todos = [t for t in todos if t.get("status", "pending") != "completed" and not t.get("completed")]
+        shown = [i for i, done in enumerate(completed) if not done]
     else:
-        display_todos = todos
+        shown = range(len(todos))
+
+    # The index keeps the sort stable and ahead of comparing dicts
+    items = [
+        (
+            TARGET_ORDER.get(target_statuses[i], 4),
+            PRIORITY_ORDER.get(priorities[i], 1),
+            i,
+            todos[i],
+            target_statuses[i],
+            days_left[i],
+        )
+        for i in shown
+    ]
 
-    if not display_todos:
+    if not items:
         if filter_by == "overdue":
-            print("🎉 No overdue tasks! Great job staying on track!")
+            return "🎉 No overdue tasks! Great job staying on track!\n"
         elif filter_by == "due_soon":
-            print("📅 No tasks due soon.")
+            return "📅 No tasks due soon.\n"
         else:
-            print("🎉 All tasks completed! Great job!")
-        return
-
-    # Priority colors/symbols
-    priority_symbols = {
-        "high": "🔴",
-        "medium": "🟡",
-        "low": "🟢"
-    }
+            return "🎉 All tasks completed! Great job!\n"
 
-    # Status symbols
-    status_symbols = {
-        "pending": "⏳",
-        "in_progress": "🔄",
-        "on_hold": "⏸️",
-        "completed": "✅"
-    }
+    items.sort()
 
-    print("\n" + "=" * 70)
-    print("📋 YOUR TODO LIST")
-    print("=" * 70)
-
-    # Calculate totals for summary
-    total_effort = 0
-    completed_effort = 0
-    overdue_count = 0
-
-    for todo in todos:
-        effort = todo.get("effort", "")
-        if effort:
-            try:
-                effort_hours = float(effort)
-                total_effort += effort_hours
-                if todo.get("status") == "completed" or todo.get("completed"):
-                    completed_effort += effort_hours
-            except ValueError:
-                pass
-
-        if get_target_status(todo.get("target_date", ""), todo.get("status", "pending")) == "overdue":
-            overdue_count += 1
-
-    # Sort todos: overdue first, then by priority
-    priority_order = {"high": 0, "medium": 1, "low": 2}
-    target_order = {"overdue": 0, "due_today": 1, "due_soon": 2, "on_track": 3, "no_target": 4, "completed": 5}
-
-    display_todos.sort(key=lambda t: (
-        target_order.get(get_target_status(t.get("target_date", ""), t.get("status", "pending")), 4),
-        priority_order.get(t.get("priority", "medium"), 1)
+    return "".join(_render_todo_list(
+        items, len(todos), completed_count, total_effort, completed_effort, overdue_count
     ))
 
-    for todo in display_todos:
+
+def _render_todo_list(items, total_count, completed_count, total_effort, completed_effort, overdue_count):
+    """Yield the lines of a todo listing, each ending in a newline."""
+    yield "\n"
+    yield "=" * 70 + "\n"
+    yield "📋 YOUR TODO LIST\n"
+    yield "=" * 70 + "\n"
+
+    # Bind the lookups used for every row to locals
+    status_icon_for = STATUS_SYMBOLS.get
+    priority_symbol_for = PRIORITY_SYMBOLS.get
+    effort_label_for = EFFORT_DISPLAY.get
+
+    for _, _, _, todo, target_status, days in items:
         status = todo.get("status", "pending")
         if todo.get("completed") and status == "pending":
             status = "completed"
 
-        status_icon = status_symbols.get(status, "⬜")
-        priority = priority_symbols.get(todo.get("priority", "medium"), "⚪")
+        status_icon = status_icon_for(status, "⬜")
+        priority = priority_symbol_for(todo.get("priority", "medium"), "⚪")
         task_display = todo["task"]
 
         if status == "completed":
@@ -253,13 +404,12 @@ def list_todos(show_all=False, filter_by=None):
         # Build effort and date display
         extras = []
         if todo.get("effort"):
-            effort_label = EFFORT_DISPLAY.get(todo["effort"], f"{todo['effort']}h")
+            effort_label = effort_label_for(todo["effort"], f"{todo['effort']}h")
             extras.append(f"⏱️ {effort_label}")
 
         target_date = todo.get("target_date", "")
         if target_date:
-            days = calculate_days_until_target(target_date)
-            target_indicator = get_target_indicator(target_date, status)
+            target_indicator = target_status_indicator("completed" if status == "completed" else target_status)
             if days is not None:
                 if days < 0:
                     extras.append(f"{target_indicator} {abs(days)}d overdue")
@@ -272,43 +422,41 @@ def list_todos(show_all=False, filter_by=None):
 
         extras_str = f" ({', '.join(extras)})" if extras else ""
 
-        print(f"{status_icon} [{todo['id']}] {priority} {task_display}{extras_str}")
+        yield f"{status_icon} [{todo['id']}] {priority} {task_display}{extras_str}\n"
 
-    print("=" * 70)
+    yield "=" * 70 + "\n"
 
     # Summary
-    total = len(todos)
-    completed = len([t for t in todos if t.get("status") == "completed" or t.get("completed")])
-
-    print(f"📊 Progress: {completed}/{total} tasks completed")
+    yield f"📊 Progress: {completed_count}/{total_count} tasks completed\n"
 
     if total_effort > 0:
         remaining = total_effort - completed_effort
-        print(f"⏱️  Effort: {completed_effort:.1f}h completed / {total_effort:.1f}h total ({remaining:.1f}h remaining)")
+        yield f"⏱️  Effort: {completed_effort:.1f}h completed / {total_effort:.1f}h total ({remaining:.1f}h remaining)\n"
 
     if overdue_count > 0:
-        print(f"🚨 Warning: {overdue_count} task(s) overdue!")
+        yield f"🚨 Warning: {overdue_count} task(s) overdue!\n"
 
-    print()
+    yield "\n"
 
 
 def complete_todo(todo_id):
     """Mark a todo as completed."""
     todos = load_todos()
 
-    for todo in todos:
-        if todo["id"] == todo_id:
-            if todo.get("status") == "completed" or todo.get("completed"):
-                print(f"ℹ️  Task '{todo['task']}' is already completed!")
-                return
-            todo["status"] = "completed"
-            todo["completed"] = True
-            todo["completed_at"] = datetime.now().isoformat()
-            save_todos(todos)
-            print(f"🎉 Completed: '{todo['task']}'")
-            return
+    todo = _id_index.get(todo_id)
+    if todo is None:
+        print(f"❌ Todo with ID {todo_id} not found.")
+        return
 
-    print(f"❌ Todo with ID {todo_id} not found.")
+    if todo.get("status") == "completed" or todo.get("completed"):
+        print(f"ℹ️  Task '{todo['task']}' is already completed!")
+        return
+    todo["status"] = "completed"
+    todo["completed_at"] = datetime.now().isoformat()
+    # status now carries it; drop the flag written by older versions
+    todo.pop("completed", None)
+    save_todos(todos)
+    print(f"🎉 Completed: '{todo['task']}'")
 
 
 def set_effort(todo_id, effort):
@@ -319,15 +467,15 @@ def set_effort(todo_id, effort):
     if effort in EFFORT_OPTIONS:
         effort = EFFORT_OPTIONS[effort]
 
-    for todo in todos:
-        if todo["id"] == todo_id:
-            todo["effort"] = effort
-            save_todos(todos)
-            effort_display = EFFORT_DISPLAY.get(effort, f"{effort}h")
-            print(f"⏱️  Set effort for '{todo['task']}' to {effort_display}")
-            return
+    todo = _id_index.get(todo_id)
+    if todo is None:
+        print(f"❌ Todo with ID {todo_id} not found.")
+        return
 
-    print(f"❌ Todo with ID {todo_id} not found.")
+    todo["effort"] = effort
+    save_todos(todos)
+    effort_display = EFFORT_DISPLAY.get(effort, f"{effort}h")
+    print(f"⏱️  Set effort for '{todo['task']}' to {effort_display}")
 
 
 def set_target_date(todo_id, target_date):
@@ -339,31 +487,28 @@ def set_target_date(todo_id, target_date):
         print(f"❌ Invalid date format. Use YYYY-MM-DD, today, tomorrow, or Nd (e.g., 3d for 3 days)")
         return
 
-    for todo in todos:
-        if todo["id"] == todo_id:
-            todo["target_date"] = parsed_date
-            save_todos(todos)
-            print(f"📅 Set target date for '{todo['task']}' to {parsed_date}")
-            return
+    todo = _id_index.get(todo_id)
+    if todo is None:
+        print(f"❌ Todo with ID {todo_id} not found.")
+        return
 
-    print(f"❌ Todo with ID {todo_id} not found.")
+    todo["target_date"] = parsed_date
+    save_todos(todos)
+    print(f"📅 Set target date for '{todo['task']}' to {parsed_date}")
 
 
 def delete_todo(todo_id):
     """Delete a todo item."""
     todos = load_todos()
 
-    for i, todo in enumerate(todos):
-        if todo["id"] == todo_id:
-            removed = todos.pop(i)
-            # Re-number remaining todos
-            for j, t in enumerate(todos):
-                t["id"] = j + 1
-            save_todos(todos)
-            print(f"🗑️  Deleted: '{removed['task']}'")
-            return
+    removed = _id_index.pop(todo_id, None)
+    if removed is None:
+        print(f"❌ Todo with ID {todo_id} not found.")
+        return
 
-    print(f"❌ Todo with ID {todo_id} not found.")
+    todos.remove(removed)
+    save_todos(todos)
+    print(f"🗑️  Deleted: '{removed['task']}'")
 
 
 def clear_completed():
@@ -377,10 +522,6 @@ def clear_completed():
         print("ℹ️  No completed todos to clear.")
         return
 
-    # Re-number remaining todos
-    for i, todo in enumerate(active_todos):
-        todo["id"] = i + 1
-
     save_todos(active_todos)
     print(f"🗑️  Cleared {removed_count} completed todo(s).")
 
@@ -437,8 +578,163 @@ Target Date Indicators:
     print(help_text)
 
 
+def cmd_quit(args):
+    """Exit the application."""
+    print("👋 Goodbye! Have a productive day!")
+    return True
+
+
+def cmd_help(args):
+    """Show the help message."""
+    print_help()
+
+
+def cmd_add(args):
+    """Parse and run the add command."""
+    if not args:
+        print("❌ Please provide a task. Example: add 'Buy milk' high 1h tomorrow")
+        return
+
+    # Parse task and optional parameters
+    # Format: add "task" [priority] [effort] [date]
+    remaining = args
+
+    # Extract task (may be quoted)
+    if remaining.startswith('"') or remaining.startswith("'"):
+        quote_char = remaining[0]
+        end_quote = remaining.find(quote_char, 1)
+        if end_quote > 0:
+            task = remaining[1:end_quote]
+            remaining = remaining[end_quote + 1:].strip()
+        else:
+            task = remaining.strip('"\'')
+            remaining = ""
+    else:
+        # Split by spaces, task is first word
+        task_parts = remaining.split()
+        task = task_parts[0]
+        remaining = " ".join(task_parts[1:])
+
+    # Parse remaining parameters
+    priority = "medium"
+    effort = ""
+    target_date = ""
+
+    if remaining:
+        params = remaining.split()
+        for param in params:
+            param_lower = param.lower()
+            if param_lower in PRIORITIES:
+                priority = param_lower
+            elif param_lower in EFFORT_OPTIONS:
+                effort = param_lower
+            elif _DATE_HINT.match(param_lower) and parse_date(param):
+                target_date = param
+
+    add_todo(task, priority, effort, target_date)
+
+
+def cmd_list(args):
+    """Parse and run the list command."""
+    args_lower = args.lower()
+    if args_lower == "all":
+        list_todos(show_all=True)
+    elif args_lower == "overdue":
+        list_todos(filter_by="overdue")
+    elif args_lower == "due":
+        list_todos(filter_by="due_soon")
+    else:
+        list_todos(show_all=False)
+
+
+def cmd_done(args):
+    """Parse and run the done command."""
+    if not args:
+        print("❌ Please provide a todo ID. Example: done 1")
+        return
+    try:
+        todo_id = int(args)
+        complete_todo(todo_id)
+    except ValueError:
+        print("❌ Invalid ID. Please provide a number.")
+
+
+def cmd_effort(args):
+    """Parse and run the effort command."""
+    if not args:
+        print("❌ Please provide a todo ID and effort. Example: effort 1 2h")
+        return
+    try:
+        parts = args.split()
+        if len(parts) < 2:
+            print("❌ Please provide both ID and effort. Example: effort 1 2h")
+            return
+        todo_id = int(parts[0])
+        effort = parts[1].lower()
+        set_effort(todo_id, effort)
+    except ValueError:
+        print("❌ Invalid ID. Please provide a number.")
+
+
+def cmd_due(args):
+    """Parse and run the due command."""
+    if not args:
+        print("❌ Please provide a todo ID and date. Example: due 1 tomorrow")
+        return
+    try:
+        parts = args.split(maxsplit=1)
+        if len(parts) < 2:
+            print("❌ Please provide both ID and date. Example: due 1 2024-12-31")
+            return
+        todo_id = int(parts[0])
+        target_date = parts[1]
+        set_target_date(todo_id, target_date)
+    except ValueError:
+        print("❌ Invalid ID. Please provide a number.")
+
+
+def cmd_delete(args):
+    """Parse and run the delete command."""
+    if not args:
+        print("❌ Please provide a todo ID. Example: delete 1")
+        return
+    try:
+        todo_id = int(args)
+        delete_todo(todo_id)
+    except ValueError:
+        print("❌ Invalid ID. Please provide a number.")
+
+
+def cmd_clear(args):
+    """Run the clear command."""
+    clear_completed()
+
+
+# Command name (and aliases) -> handler; a handler returning True exits the loop
+COMMANDS = {
+    "quit": cmd_quit, "exit": cmd_quit, "q": cmd_quit,
+    "help": cmd_help, "h": cmd_help,
+    "add": cmd_add, "a": cmd_add,
+    "list": cmd_list, "ls": cmd_list, "l": cmd_list,
+    "done": cmd_done, "d": cmd_done,
+    "effort": cmd_effort, "e": cmd_effort,
+    "due": cmd_due, "target": cmd_due,
+    "delete": cmd_delete, "del": cmd_delete, "rm": cmd_delete,
+    "clear": cmd_clear,
+}
+
+
+def _exit_on_signal(signum, frame):
+    """Turn a hangup or terminate signal into a normal exit so flush_todos runs."""
+    raise SystemExit(128 + signum)
+
+
 def main():
     """Main application loop."""
+    for name in ("SIGHUP", "SIGTERM"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), _exit_on_signal)
+
     print("\n🌟 Welcome to your Daily Todo List Manager (Enhanced)!")
     print("Type 'help' for available commands.\n")
 
@@ -453,122 +749,11 @@ def main():
             command = parts[0].lower()
             args = parts[1] if len(parts) > 1 else ""
 
-            if command == "quit" or command == "exit" or command == "q":
-                print("👋 Goodbye! Have a productive day!")
-                break
-
-            elif command == "help" or command == "h":
-                print_help()
-
-            elif command == "add" or command == "a":
-                if not args:
-                    print("❌ Please provide a task. Example: add 'Buy milk' high 1h tomorrow")
-                    continue
-
-                # Parse task and optional parameters
-                # Format: add "task" [priority] [effort] [date]
-                remaining = args
-
-                # Extract task (may be quoted)
-                if remaining.startswith('"') or remaining.startswith("'"):
-                    quote_char = remaining[0]
-                    end_quote = remaining.find(quote_char, 1)
-                    if end_quote > 0:
-                        task = remaining[1:end_quote]
-                        remaining = remaining[end_quote + 1:].strip()
-                    else:
-                        task = remaining.strip('"\'')
-                        remaining = ""
-                else:
-                    # Split by spaces, task is first word
-                    task_parts = remaining.split()
-                    task = task_parts[0]
-                    remaining = " ".join(task_parts[1:])
-
-                # Parse remaining parameters
-                priority = "medium"
-                effort = ""
-                target_date = ""
-
-                if remaining:
-                    params = remaining.split()
-                    for param in params:
-                        param_lower = param.lower()
-                        if param_lower in ["high", "medium", "low"]:
-                            priority = param_lower
-                        elif param_lower in EFFORT_OPTIONS:
-                            effort = param_lower
-                        elif parse_date(param):
-                            target_date = param
-
-                add_todo(task, priority, effort, target_date)
-
-            elif command == "list" or command == "ls" or command == "l":
-                args_lower = args.lower()
-                if args_lower == "all":
-                    list_todos(show_all=True)
-                elif args_lower == "overdue":
-                    list_todos(filter_by="overdue")
-                elif args_lower == "due":
-                    list_todos(filter_by="due_soon")
-                else:
-                    list_todos(show_all=False)
-
-            elif command == "done" or command == "d":
-                if not args:
-                    print("❌ Please provide a todo ID. Example: done 1")
-                    continue
-                try:
-                    todo_id = int(args)
-                    complete_todo(todo_id)
-                except ValueError:
-                    print("❌ Invalid ID. Please provide a number.")
-
-            elif command == "effort" or command == "e":
-                if not args:
-                    print("❌ Please provide a todo ID and effort. Example: effort 1 2h")
-                    continue
-                try:
-                    parts = args.split()
-                    if len(parts) < 2:
-                        print("❌ Please provide both ID and effort. Example: effort 1 2h")
-                        continue
-                    todo_id = int(parts[0])
-                    effort = parts[1].lower()
-                    set_effort(todo_id, effort)
-                except ValueError:
-                    print("❌ Invalid ID. Please provide a number.")
-
-            elif command == "due" or command == "target":
-                if not args:
-                    print("❌ Please provide a todo ID and date. Example: due 1 tomorrow")
-                    continue
-                try:
-                    parts = args.split(maxsplit=1)
-                    if len(parts) < 2:
-                        print("❌ Please provide both ID and date. Example: due 1 2024-12-31")
-                        continue
-                    todo_id = int(parts[0])
-                    target_date = parts[1]
-                    set_target_date(todo_id, target_date)
-                except ValueError:
-                    print("❌ Invalid ID. Please provide a number.")
-
-            elif command == "delete" or command == "del" or command == "rm":
-                if not args:
-                    print("❌ Please provide a todo ID. Example: delete 1")
-                    continue
-                try:
-                    todo_id = int(args)
-                    delete_todo(todo_id)
-                except ValueError:
-                    print("❌ Invalid ID. Please provide a number.")
-
-            elif command == "clear":
-                clear_completed()
-
-            else:
+            handler = COMMANDS.get(command)
+            if handler is None:
                 print(f"❌ Unknown command: '{command}'. Type 'help' for available commands.")
+            elif handler(args):
+                break
 
         except KeyboardInterrupt:
             print("\n👋 Goodbye! Have a productive day!")